@@ -1,8 +1,9 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 from datetime import datetime
 import numpy as np
+import hashlib
+import hmac
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -28,13 +29,21 @@ def initialize_session_state():
     if 'name' not in st.session_state:
         st.session_state['name'] = None
 
+# Built once per process: username -> (sha256 of password, display name)
+_USERS = {
+    'admin': (hashlib.sha256(b'admin123').digest(), 'Admin'),
+    'powergrid': (hashlib.sha256(b'sih2025').digest(), 'POWERGRID')
+}
+
 def check_credentials(username, password):
-    users = {
-        'admin': {'password': 'admin123', 'name': 'Admin'},
-        'powergrid': {'password': 'sih2025', 'name': 'POWERGRID'}
-    }
-    if username in users and users[username]['password'] == password:
-        return True, users[username]['name']
+    if not username or not password:
+        return False, None
+    user = _USERS.get(username)
+    if user is None:
+        return False, None
+    digest = hashlib.sha256(password.encode()).digest()
+    if hmac.compare_digest(user[0], digest):
+        return True, user[1]
     return False, None
 
 def logout():
@@ -93,11 +102,15 @@ with st.sidebar:
 
 from inventory_data import get_dashboard_summary
 
-@st.cache_data
+@st.cache_resource
 def load_dashboard_data():
     """Load dashboard summary (aggregated from all SKUs)"""
     return get_dashboard_summary()
 
+def get_critical_items(materials_data):
+    """Materials below their reorder point, shared by the alerts list and the auto dialog"""
+    return materials_data[materials_data['Stock'] < materials_data['Reorder_Point']]
+
 def calculate_status(stock, reorder):
     if stock >= reorder:
         return '🟢 In Stock'
@@ -115,22 +128,22 @@ def show_critical_alert(critical_items_df):
     
     st.markdown("---")
     
-    for idx, item in critical_items_df.iterrows():
+    for item in critical_items_df.itertuples(index=False):
         col1, col2 = st.columns([2, 1])
         
         with col1:
-            if item['Stock'] < item['Reorder_Point'] * 0.5:
-                st.error(f"🔴 **{item['Material']}** - CRITICAL")
+            if item.Stock < item.Reorder_Point * 0.5:
+                st.error(f"🔴 **{item.Material}** - CRITICAL")
                 level = "CRITICAL"
             else:
-                st.warning(f"🟡 **{item['Material']}** - Low Stock")
+                st.warning(f"🟡 **{item.Material}** - Low Stock")
                 level = "LOW"
             
-            st.write(f"Current: **{item['Stock']} units**")
-            st.write(f"Reorder at: **{item['Reorder_Point']} units**")
-            shortage = item['Reorder_Point'] - item['Stock']
+            st.write(f"Current: **{item.Stock} units**")
+            st.write(f"Reorder at: **{item.Reorder_Point} units**")
+            shortage = item.Reorder_Point - item.Stock
             st.write(f"Shortage: **{shortage} units**")
-            percentage = (item['Stock'] / item['Reorder_Point']) * 100
+            percentage = (item.Stock / item.Reorder_Point) * 100
             st.write(f"Stock Level: **{percentage:.1f}%** of reorder point")
         
         with col2:
@@ -147,16 +160,10 @@ def show_critical_alert(critical_items_df):
             st.session_state['alert_dismissed'] = True
             st.rerun()
 
-# ========== MAIN CONTENT ==========
+# ========== INVENTORY & ALERTS ==========
 
-if st.session_state['authentication_status']:
-    
-    st.title("🔌 POWERGRID Material Forecasting")
-    st.caption("Ministry of Power, Govt of India")
-    st.markdown("---")
-    
-    # ========== LOAD INVENTORY DATA ==========
-    
+@st.fragment
+def render_inventory_block():
     materials_data = load_dashboard_data()
     
     # MATERIAL INVENTORY
@@ -178,22 +185,12 @@ if st.session_state['authentication_status']:
         )
     
     with col2:
-        fig = px.pie(
-            materials_data, 
-            values='Stock',
-            names='Material',
-            hole=0.4,
-            color_discrete_sequence=['#00D9FF', '#FFA500', '#00FF88', '#FF4444']
-        )
-        
-        fig.update_traces(
-            textposition='inside', 
-            textinfo='percent+label',
-            hovertemplate='<b>%{label}</b><br>%{value} units<br>%{percent}<extra></extra>'
+        # Native chart: no Plotly bundle needed for four bars
+        st.bar_chart(
+            materials_data.set_index('Material')['Stock'],
+            color='#00D9FF',
+            height=280
         )
-        fig.update_layout(height=280, showlegend=False, margin=dict(l=20, r=20, t=20, b=20))
-        
-        st.plotly_chart(fig, use_container_width=True, key="home_pie")
     
     st.caption("**Status Logic:** 🟢 Above reorder | 🟡 Below reorder | 🔴 Below 50% of reorder")
     
@@ -202,21 +199,21 @@ if st.session_state['authentication_status']:
     # ALERTS
     st.markdown("### 🔔 Smart Alerts")
     
-    critical_items = materials_data[materials_data['Stock'] < materials_data['Reorder_Point']]
+    critical_items = get_critical_items(materials_data)
     
     if len(critical_items) > 0:
-        for idx, item in critical_items.iterrows():
-            shortage = item['Reorder_Point'] - item['Stock']
-            percentage = (item['Stock'] / item['Reorder_Point']) * 100
+        for item in critical_items.itertuples(index=False):
+            shortage = item.Reorder_Point - item.Stock
+            percentage = (item.Stock / item.Reorder_Point) * 100
             
-            if item['Stock'] < item['Reorder_Point'] * 0.5:
+            if item.Stock < item.Reorder_Point * 0.5:
                 st.error(
-                    f"🔴 **CRITICAL: {item['Material']}** - Stock at {item['Stock']} units "
+                    f"🔴 **CRITICAL: {item.Material}** - Stock at {item.Stock} units "
                     f"({percentage:.1f}% of reorder point) | Shortage: {shortage} units"
                 )
             else:
                 st.warning(
-                    f"🟡 **LOW STOCK: {item['Material']}** - {item['Stock']} units "
+                    f"🟡 **LOW STOCK: {item.Material}** - {item.Stock} units "
                     f"({percentage:.1f}% of reorder point) | Need: {shortage} units"
                 )
         
@@ -228,6 +225,20 @@ if st.session_state['authentication_status']:
     
     if 'forecast_df' in st.session_state:
         st.success("✅ Forecast available for viewing")
+
+# ========== MAIN CONTENT ==========
+
+if st.session_state['authentication_status']:
+    
+    st.title("🔌 POWERGRID Material Forecasting")
+    st.caption("Ministry of Power, Govt of India")
+    st.markdown("---")
+    
+    # Reruns on its own when its widgets change, without rerunning the whole page
+    render_inventory_block()
+    
+    # Cached summary, used below for the auto dialog
+    critical_items = get_critical_items(load_dashboard_data())
     
     st.markdown("---")
     
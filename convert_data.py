@@ -0,0 +1,18 @@
+import pandas as pd
+
+# hybrid_cleaned.csv is the source dataset; the app pages read the Parquet copy
+CSV_FILE = 'hybrid_cleaned.csv'
+PARQUET_FILE = 'hybrid_cleaned.parquet'
+
+
+def convert_to_parquet(csv_path=CSV_FILE, parquet_path=PARQUET_FILE):
+    """Rebuild the Parquet copy of the dataset from the CSV, with Date parsed as datetime"""
+    df = pd.read_csv(csv_path, parse_dates=['Date'])
+    df.to_parquet(parquet_path, engine='pyarrow', index=False)
+    return df
+
+
+# Run after editing the CSV: python convert_data.py
+if __name__ == "__main__":
+    df = convert_to_parquet()
+    print(f"✅ Wrote {len(df)} rows to {PARQUET_FILE}")
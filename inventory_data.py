@@ -1,109 +1,82 @@
+import streamlit as st
 import pandas as pd
 import numpy as np
+from functools import lru_cache
 from scipy.stats import norm
 
+# Seed for a local generator so inventory data is consistent across runs and threads
+_RNG_SEED = 42
 
-def calculate_inventory_metrics(avg_demand_per_day, lead_time_days, demand_std_dev, service_level=0.95):
-    """Calculate safety stock and reorder point using Z-score method"""
-    try:
-        z_score = norm.ppf(service_level)
-        safety_stock = z_score * demand_std_dev * np.sqrt(lead_time_days)
-        reorder_point = (avg_demand_per_day * lead_time_days) + safety_stock
-        
-        return {
-            'safety_stock': int(max(safety_stock, 0)),
-            'reorder_point': int(max(reorder_point, 0))
-        }
-    except Exception as e:
-        print(f"Error in calculate_inventory_metrics: {e}")
-        return {'safety_stock': 100, 'reorder_point': 500}
 
+@lru_cache(maxsize=16)
+def _zscore(service_level):
+    """Z-score for a service level, cached since norm.ppf is slow per call"""
+    return float(norm.ppf(service_level))
 
+
+@st.cache_resource(ttl=3600)
 def load_full_inventory():
     """Generate complete inventory with all SKUs - creates matching sums for dashboard"""
-    try:
-        materials = ['Steel', 'Cement', 'Conductors', 'Equipment']
-        data = []
-        
-        np.random.seed(42)  # Consistent data generation
-        
-        for i, material in enumerate(materials):
-            for j in range(5):  # 5 SKUs per material
-                avg_daily_demand = np.random.randint(20, 80)
-                demand_std_dev = avg_daily_demand * 0.3
-                lead_time_days = np.random.randint(15, 45)
-                
-                metrics = calculate_inventory_metrics(
-                    avg_daily_demand, 
-                    lead_time_days, 
-                    demand_std_dev
-                )
-                
-                reorder_point = metrics['reorder_point']
-                
-                # MAKE MULTIPLE SKUs LOW/CRITICAL SO SUM TRIGGERS ALERTS
-                if material == 'Cement':
-                    # Make ALL 5 cement SKUs low so their SUM is also low
-                    if j == 0:
-                        current_stock = int(reorder_point * 0.3)
-                    elif j == 1:
-                        current_stock = int(reorder_point * 0.5)
-                    elif j == 2:
-                        current_stock = int(reorder_point * 0.6)
-                    elif j == 3:
-                        current_stock = int(reorder_point * 0.7)
-                    else:  # j == 4
-                        current_stock = int(reorder_point * 0.65)
-                        
-                elif material == 'Equipment':
-                    # Make ALL 5 equipment SKUs critical so their SUM is critical
-                    if j == 0:
-                        current_stock = int(reorder_point * 0.2)
-                    elif j == 1:
-                        current_stock = int(reorder_point * 0.3)
-                    elif j == 2:
-                        current_stock = int(reorder_point * 0.35)
-                    elif j == 3:
-                        current_stock = int(reorder_point * 0.4)
-                    else:  # j == 4
-                        current_stock = int(reorder_point * 0.25)
-                        
-                else:
-                    # Steel and Conductors = In Stock (normal high values)
-                    current_stock = np.random.randint(int(reorder_point * 1.2), int(reorder_point * 2.5))
-                
-                # Calculate status AFTER setting current_stock
-                if current_stock < reorder_point * 0.5:
-                    status = 'Critical'
-                elif current_stock < reorder_point:
-                    status = 'Low Stock'
-                else:
-                    status = 'In Stock'
-                
-                # Now append with status defined
-                data.append({
-                    'Material_ID': f'M{i}{j:03d}',
-                    'Material': material,
-                    'Current_Stock': current_stock,
-                    'Reorder_Point': reorder_point,
-                    'Safety_Stock': metrics['safety_stock'],
-                    'Avg_Daily_Demand': avg_daily_demand,
-                    'Lead_Time_Days': lead_time_days,
-                    'Unit_Cost': round(np.random.uniform(50, 500), 2),
-                    'Supplier': f'Supplier {chr(65 + np.random.randint(0, 5))}',
-                    'Status': status,
-                    'Service_Level': '95%'
-                })
-        
-        df = pd.DataFrame(data)
-        print(f"✅ load_full_inventory generated {len(df)} rows")
-        return df
-        
-    except Exception as e:
-        print(f"❌ Error in load_full_inventory: {e}")
-        return pd.DataFrame(columns=['Material_ID', 'Material', 'Current_Stock', 'Reorder_Point', 
-                                    'Safety_Stock', 'Avg_Daily_Demand', 'Lead_Time_Days', 
-                                    'Unit_Cost', 'Supplier', 'Status', 'Service_Level'])
+    materials = ['Steel', 'Cement', 'Conductors', 'Equipment']
+    skus_per_material = 5
+    n_skus = len(materials) * skus_per_material
+    
+    rng = np.random.default_rng(_RNG_SEED)
+    
+    material_idx = np.repeat(np.arange(len(materials)), skus_per_material)
+    sku_idx = np.tile(np.arange(skus_per_material), len(materials))
+    
+    # One (demand, lead time) draw per SKU; values differ from the old per-SKU loop but each material keeps its status mix
+    avg_daily_demand, lead_time_days = rng.integers([20, 15], [80, 45], size=(n_skus, 2)).T
+    demand_std_dev = avg_daily_demand * 0.3
+    
+    # Z-score method, computed once for all SKUs
+    z_score = _zscore(0.95)
+    safety_stock = z_score * demand_std_dev * np.sqrt(lead_time_days)
+    reorder_point = np.maximum((avg_daily_demand * lead_time_days) + safety_stock, 0).astype(int)
+    safety_stock = np.maximum(safety_stock, 0).astype(int)
+    
+    # MAKE MULTIPLE SKUs LOW/CRITICAL SO SUM TRIGGERS ALERTS
+    # Cement: all 5 SKUs low so their SUM is also low
+    # Equipment: all 5 SKUs critical so their SUM is critical
+    # Steel and Conductors (NaN) = In Stock (normal high values)
+    stock_multipliers = np.concatenate([
+        np.full(skus_per_material, np.nan),
+        [0.3, 0.5, 0.6, 0.7, 0.65],
+        np.full(skus_per_material, np.nan),
+        [0.2, 0.3, 0.35, 0.4, 0.25]
+    ])
+    in_stock = np.isnan(stock_multipliers)
+    
+    current_stock = np.empty(n_skus, dtype=int)
+    current_stock[~in_stock] = (reorder_point[~in_stock] * stock_multipliers[~in_stock]).astype(int)
+    current_stock[in_stock] = rng.integers(
+        (reorder_point[in_stock] * 1.2).astype(int),
+        (reorder_point[in_stock] * 2.5).astype(int)
+    )
+    
+    # Calculate status AFTER setting current_stock
+    status = np.select(
+        [current_stock < reorder_point * 0.5, current_stock < reorder_point],
+        ['Critical', 'Low Stock'],
+        default='In Stock'
+    )
+    
+    df = pd.DataFrame({
+        'Material_ID': [f'M{i}{j:03d}' for i, j in zip(material_idx, sku_idx)],
+        'Material': np.array(materials)[material_idx],
+        'Current_Stock': current_stock,
+        'Reorder_Point': reorder_point,
+        'Safety_Stock': safety_stock,
+        'Avg_Daily_Demand': avg_daily_demand,
+        'Lead_Time_Days': lead_time_days,
+        'Unit_Cost': rng.uniform(50, 500, size=n_skus).round(2),
+        'Supplier': np.char.add('Supplier ', np.array(list('ABCDE'))[rng.integers(0, 5, size=n_skus)]),
+        'Status': status,
+        'Service_Level': '95%'
+    })
+    print(f"✅ load_full_inventory generated {len(df)} rows")
+    return df
 
 
 def get_dashboard_summary():
@@ -124,18 +97,13 @@ def get_dashboard_summary():
         # Rename to match dashboard column names
         summary.rename(columns={'Current_Stock': 'Stock'}, inplace=True)
         
-        # Calculate status based on summed values
-        def calc_status(stock, reorder):
-            if stock >= reorder:
-                return '🟢 In Stock'
-            elif stock < reorder * 0.5:
-                return '🔴 Critical'
-            else:
-                return '🟡 Low Stock'
-        
-        summary['Status'] = summary.apply(
-            lambda row: calc_status(row['Stock'], row['Reorder_Point']),
-            axis=1
+        # Calculate status based on summed values (vectorized)
+        stock = summary['Stock'].to_numpy()
+        reorder = summary['Reorder_Point'].to_numpy()
+        summary['Status'] = np.select(
+            [stock >= reorder, stock < reorder * 0.5],
+            ['🟢 In Stock', '🔴 Critical'],
+            default='🟡 Low Stock'
         )
         
         print(f"✅ get_dashboard_summary generated {len(summary)} rows")
@@ -4,7 +4,10 @@ import numpy as np
 from prophet import Prophet
 import plotly.graph_objects as go
 from datetime import datetime
+import os
 import pickle
+import tempfile
+import threading
 
 # Check authentication
 if 'authentication_status' not in st.session_state or not st.session_state['authentication_status']:
@@ -14,14 +17,109 @@ if 'authentication_status' not in st.session_state or not st.session_state['auth
 st.title("🔮 Demand Forecasting")
 st.caption("Ministry of Power, Govt of India")
 
+DATA_FILE = 'hybrid_cleaned.parquet'
+
 # Load data
-@st.cache_data
-def load_data():
-    df = pd.read_csv('hybrid_cleaned.csv')
-    df['Date'] = pd.to_datetime(df['Date'])
-    return df
+@st.cache_resource(max_entries=1)
+def load_data(data_mtime):
+    # Parquet keeps Date typed, and only the two forecasting columns are read
+    return pd.read_parquet(DATA_FILE, engine='pyarrow', dtype_backend='pyarrow', columns=['Date', 'Quantity_Procured'])
+
+@st.cache_resource(max_entries=1)
+def load_daily_series(data_mtime):
+    """Total quantity procured per day, shared by model training and the plot"""
+    df = load_data(data_mtime)
+    return df.groupby('Date', sort=True)['Quantity_Procured'].sum().reset_index()
+
+@st.cache_resource(max_entries=1)
+def load_monthly_series(data_mtime):
+    """Monthly totals in Prophet's ds/y format; the forecast is monthly so there's no need to fit on finer data"""
+    df = load_data(data_mtime)
+    monthly = df.set_index('Date').resample('MS')['Quantity_Procured'].sum().reset_index()
+    monthly.columns = ['ds', 'y']
+    # Prophet's fitting code expects NumPy-backed columns, not the Arrow ones read from disk
+    return monthly.astype({'ds': 'datetime64[ns]', 'y': 'float64'})
+
+def lttb_indices(x, y, n_out):
+    """Row indices kept by Largest-Triangle-Three-Buckets downsampling"""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    
+    # First and last points are always kept; the rest is split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    keep = np.empty(n_out, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+    
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_x = x[end:edges[i + 2]].mean()
+            next_y = y[end:edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        
+        # Keep the point forming the largest triangle with the previous pick and next bucket's mean
+        area = np.abs((x[a] - next_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (next_y - y[a]))
+        a = start + int(area.argmax())
+        keep[i + 1] = a
+    
+    return keep
 
-df = load_data()
+@st.cache_resource(max_entries=1)
+def load_plot_series(data_mtime, max_points=1000):
+    """Historical series downsampled for plotting; the browser can't show more points than pixels"""
+    daily = load_daily_series(data_mtime)
+    idx = lttb_indices(daily['Date'].to_numpy().astype('int64'), daily['Quantity_Procured'].to_numpy(), max_points)
+    return daily.iloc[idx]
+
+@st.cache_resource
+def model_save_lock():
+    """One lock shared by every session and rerun, so saves of the model file never overlap"""
+    return threading.Lock()
+
+def save_model(model, lock, path='powergrid_model.pkl'):
+    """Pickle the model to its own temp file and swap it in, so readers never see a partial write"""
+    with lock:
+        # A save killed at shutdown can leave this file behind; *.tmp is git-ignored
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=f'{os.path.basename(path)}.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(model, f, protocol=5)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def run_prophet(data_mtime, periods, confidence):
+    """Train Prophet and forecast; re-runs only when the data file or parameters change"""
+    forecast_df = load_monthly_series(data_mtime)
+    
+    model = Prophet(
+        yearly_seasonality=True,
+        weekly_seasonality=False,
+        daily_seasonality=False,
+        interval_width=confidence/100
+    )
+    
+    model.fit(forecast_df)
+    
+    future = model.make_future_dataframe(periods=periods, freq='MS')
+    forecast = model.predict(future)
+    
+    # Save to disk in the background so the UI isn't blocked; only fresh fits are saved, not cache hits.
+    # The lock is fetched here because cached functions need the script thread's context
+    threading.Thread(target=save_model, args=(model, model_save_lock()), daemon=True).start()
+    
+    return model, forecast
+
+# Data file mtime busts every cache above when the dataset is regenerated; the loaders keep only the latest copy
+data_mtime = os.path.getmtime(DATA_FILE)
 
 st.markdown("---")
 
@@ -42,32 +140,13 @@ if st.button("🚀 Generate Forecast", type="primary", use_container_width=True)
     
     with st.spinner("Training Prophet model... This may take a moment"):
         
-        # Prepare data
-        forecast_df = df.groupby('Date')['Quantity_Procured'].sum().reset_index()
-        forecast_df.columns = ['ds', 'y']
-        
-        # Train model
-        model = Prophet(
-            yearly_seasonality=True,
-            weekly_seasonality=False,
-            daily_seasonality=False,
-            interval_width=confidence/100
-        )
-        
-        model.fit(forecast_df)
-        
-        # Make predictions
-        future = model.make_future_dataframe(periods=periods, freq='M')
-        forecast = model.predict(future)
+        # Train model and make predictions (cached per parameter set)
+        model, forecast = run_prophet(data_mtime, periods, confidence)
         
         # Save to session state
         st.session_state['forecast_df'] = forecast
         st.session_state['model'] = model
         st.session_state['periods'] = periods
-        
-        # Save model to disk
-        with open('powergrid_model.pkl', 'wb') as f:
-            pickle.dump(model, f)
     
     st.success(f"✅ Forecast generated for next {periods} months!")
     st.rerun()
@@ -85,9 +164,9 @@ if 'forecast_df' in st.session_state and st.session_state['forecast_df'] is not
     
     fig = go.Figure()
     
-    # Historical data
-    historical = df.groupby('Date')['Quantity_Procured'].sum().reset_index()
-    fig.add_trace(go.Scatter(
+    # Historical data (WebGL lines render faster than SVG for long series)
+    historical = load_plot_series(data_mtime)
+    fig.add_trace(go.Scattergl(
         x=historical['Date'],
         y=historical['Quantity_Procured'],
         mode='lines',
@@ -97,7 +176,7 @@ if 'forecast_df' in st.session_state and st.session_state['forecast_df'] is not
     
     # Forecast
     future_forecast = forecast.tail(periods)
-    fig.add_trace(go.Scatter(
+    fig.add_trace(go.Scattergl(
         x=future_forecast['ds'],
         y=future_forecast['yhat'],
         mode='lines',
@@ -105,24 +184,18 @@ if 'forecast_df' in st.session_state and st.session_state['forecast_df'] is not
         line=dict(color='#FFA500', width=2, dash='dash')
     ))
     
-    # Confidence interval
+    # Confidence interval as one closed polygon: upper bound out, lower bound back
+    band_x = np.concatenate([future_forecast['ds'].to_numpy(), future_forecast['ds'].to_numpy()[::-1]])
+    band_y = np.concatenate([future_forecast['yhat_upper'].to_numpy(), future_forecast['yhat_lower'].to_numpy()[::-1]])
     fig.add_trace(go.Scatter(
-        x=future_forecast['ds'],
-        y=future_forecast['yhat_upper'],
-        mode='lines',
-        name='Upper Bound',
-        line=dict(width=0),
-        showlegend=False
-    ))
-    
-    fig.add_trace(go.Scatter(
-        x=future_forecast['ds'],
-        y=future_forecast['yhat_lower'],
+        x=band_x,
+        y=band_y,
         mode='lines',
-        name='Lower Bound',
+        name='Confidence Interval',
         line=dict(width=0),
-        fill='tonexty',
+        fill='toself',
         fillcolor='rgba(255, 165, 0, 0.2)',
+        hoverinfo='skip',
         showlegend=False
     ))
     
@@ -1,8 +1,5 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
 from datetime import datetime
-from scipy.stats import norm
 
 # Check authentication
 if 'authentication_status' not in st.session_state or not st.session_state['authentication_status']:
@@ -14,99 +11,14 @@ st.caption("Ministry of Power, Govt of India")
 
 # ==================== HELPER FUNCTIONS ====================
 
-def calculate_inventory_metrics(avg_demand_per_day, lead_time_days, demand_std_dev, service_level=0.95):
-    """Calculate safety stock and reorder point using Z-score method"""
-    z_score = norm.ppf(service_level)
-    safety_stock = z_score * demand_std_dev * np.sqrt(lead_time_days)
-    reorder_point = (avg_demand_per_day * lead_time_days) + safety_stock
-    
-    return {
-        'safety_stock': int(max(safety_stock, 0)),
-        'reorder_point': int(max(reorder_point, 0)),
-        'z_score': round(z_score, 2)
-    }
-
-def calculate_eoq(annual_demand, ordering_cost, unit_cost, holding_rate):
-    """Calculate Economic Order Quantity"""
-    holding_cost = unit_cost * (holding_rate / 100)
-    eoq = np.sqrt((2 * annual_demand * ordering_cost) / holding_cost)
-    return int(eoq)
+@st.cache_data(max_entries=32)
+def convert_to_csv(df):
+    """CSV bytes for download, cached so reruns don't re-encode unchanged data"""
+    return df.to_csv(index=False).encode('utf-8')
 
 # ==================== LOAD INVENTORY DATA ====================
 
-@st.cache_data
-def load_inventory():
-    """Generate complete inventory data"""
-    materials = ['Steel', 'Cement', 'Conductors', 'Equipment']
-    data = []
-    
-    np.random.seed(42)
-    
-    for i, material in enumerate(materials):
-        for j in range(5):
-            avg_daily_demand = np.random.randint(20, 80)
-            demand_std_dev = avg_daily_demand * 0.3
-            lead_time_days = np.random.randint(15, 45)
-            
-            metrics = calculate_inventory_metrics(
-                avg_daily_demand, 
-                lead_time_days, 
-                demand_std_dev
-            )
-            
-            reorder_point = metrics['reorder_point']
-            
-            # Create low stock scenarios
-            if material == 'Cement':
-                if j == 0:
-                    current_stock = int(reorder_point * 0.3)
-                elif j == 1:
-                    current_stock = int(reorder_point * 0.5)
-                elif j == 2:
-                    current_stock = int(reorder_point * 0.6)
-                elif j == 3:
-                    current_stock = int(reorder_point * 0.7)
-                else:
-                    current_stock = int(reorder_point * 0.65)
-                    
-            elif material == 'Equipment':
-                if j == 0:
-                    current_stock = int(reorder_point * 0.2)
-                elif j == 1:
-                    current_stock = int(reorder_point * 0.3)
-                elif j == 2:
-                    current_stock = int(reorder_point * 0.35)
-                elif j == 3:
-                    current_stock = int(reorder_point * 0.4)
-                else:
-                    current_stock = int(reorder_point * 0.25)
-                    
-            else:
-                current_stock = np.random.randint(int(reorder_point * 1.2), int(reorder_point * 2.5))
-            
-            # Calculate status
-            if current_stock < reorder_point * 0.5:
-                status = 'Critical'
-            elif current_stock < reorder_point:
-                status = 'Low Stock'
-            else:
-                status = 'In Stock'
-            
-            data.append({
-                'Material_ID': f'M{i}{j:03d}',
-                'Material': material,
-                'Current_Stock': current_stock,
-                'Reorder_Point': reorder_point,
-                'Safety_Stock': metrics['safety_stock'],
-                'Avg_Daily_Demand': avg_daily_demand,
-                'Lead_Time_Days': lead_time_days,
-                'Unit_Cost': round(np.random.uniform(50, 500), 2),
-                'Supplier': f'Supplier {chr(65 + np.random.randint(0, 5))}',
-                'Status': status,
-                'Service_Level': '95%'
-            })
-    
-    return pd.DataFrame(data)
+from inventory_data import load_full_inventory as load_inventory
 
 inventory_df = load_inventory()
 
@@ -135,14 +47,13 @@ with col3:
         default=['In Stock', 'Low Stock', 'Critical']
     )
 
-# Apply filters
-filtered_df = inventory_df.copy()
+# Apply filters (one combined mask, one indexing step)
+mask = inventory_df['Material'].isin(material_filter) & inventory_df['Status'].isin(status_filter)
 
 if search_term:
-    filtered_df = filtered_df[filtered_df['Material_ID'].str.contains(search_term, case=False)]
+    mask &= inventory_df['Material_ID'].str.contains(search_term, case=False, regex=False, na=False)
 
-filtered_df = filtered_df[filtered_df['Material'].isin(material_filter)]
-filtered_df = filtered_df[filtered_df['Status'].isin(status_filter)]
+filtered_df = inventory_df.loc[mask]
 
 st.markdown(f"**Showing {len(filtered_df)} of {len(inventory_df)} items**")
 
@@ -152,16 +63,13 @@ st.markdown("---")
 
 st.markdown("### 📋 Detailed Inventory View")
 
-def get_status_icon(status):
-    icons = {
-        'In Stock': '🟢',
-        'Low Stock': '🟠',
-        'Critical': '🔴'
-    }
-    return icons.get(status, '⚪')
+_ICON_MAP = {
+    'In Stock': '🟢',
+    'Low Stock': '🟠',
+    'Critical': '🔴'
+}
 
-display_df = filtered_df.copy()
-display_df[''] = display_df['Status'].apply(get_status_icon)
+display_df = filtered_df.assign(**{'': filtered_df['Status'].map(_ICON_MAP).fillna('⚪')})
 
 st.dataframe(
     display_df[['', 'Material_ID', 'Material', 'Current_Stock', 
@@ -218,7 +126,7 @@ if len(low_stock_items) > 0:
         )
 
 st.markdown("---")
-csv = filtered_df.to_csv(index=False)
+csv = convert_to_csv(filtered_df)
 st.download_button(
     label="📥 Export to CSV",
     data=csv,
@@ -1,6 +1,8 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
 
 # Authentication check
 if 'authentication_status' not in st.session_state or not st.session_state['authentication_status']:
@@ -33,92 +35,187 @@ state_map = {
     # Add other codes/numeric values as needed!
 }
 
-# ===== DATA LOAD + COLUMN SANITIZATION =====
-@st.cache_data
-def load_data():
-    df = pd.read_csv('hybrid_cleaned.csv')
-    df.columns = [c.strip().replace(" ", "_") for c in df.columns]  # handles whitespace and weird headers
-    # Derive user-friendly fields for mapping
-    project_type_base = df.columns[df.columns.str.lower().str.contains("project_ty|project_type")][0]
-    state_base = df.columns[df.columns.str.lower().str.contains("state")][0]
-    df['Project_Type_Full'] = df[project_type_base].map(project_type_map).fillna(df[project_type_base].astype(str))
-    df['State_Full'] = df[state_base].map(state_map).fillna(df[state_base].astype(str))
-    df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-    return df
-
-df = load_data()
+# Only the columns this page uses, with the narrowest types that hold them
+NEEDED_COLUMNS = ['Date', 'State', 'Project_Type', 'Quantity_Procured', 'GST_Rate']
+COLUMN_DTYPES = {
+    'State': 'category',
+    'Project_Type': 'category',
+    'Quantity_Procured': 'float32',
+    'GST_Rate': 'float32'
+}
 
-st.markdown("---")
+def category_label(value, label_map):
+    """Display label for a raw category: exact key, or truncated prefix ('Maharash')"""
+    if value in label_map:
+        return label_map[value]
+    if isinstance(value, str):
+        for key, label in label_map.items():
+            if isinstance(key, str) and value.startswith(key):
+                return label
+    return str(value)
 
-# ======================= FILTERS =========================
-st.markdown("### 🔎 Filter Procurement Data")
+def relabel_categories(col, label_map):
+    """Relabel a categorical column through its few categories instead of every row"""
+    labels = pd.Index([category_label(c, label_map) for c in col.cat.categories])
+    if labels.is_unique:
+        return col.cat.rename_categories(labels)
+    # Aliases such as "Transmissi"/"Transmission" share a label: merge their codes
+    merged = labels.unique()
+    raw_codes = col.cat.codes.to_numpy()
+    codes = np.where(raw_codes >= 0, merged.get_indexer(labels)[raw_codes], -1)
+    return pd.Series(pd.Categorical.from_codes(codes, categories=merged), index=col.index, name=col.name)
 
-col1, col2 = st.columns(2)
-with col1:
-    states = ['All'] + sorted(df['State_Full'].dropna().unique().tolist())
-    selected_state = st.selectbox("Select State", options=states)
-with col2:
-    project_types = ['All'] + sorted(df['Project_Type_Full'].dropna().unique().tolist())
-    selected_project = st.selectbox("Select Project Type", options=project_types)
+def m4_downsample(data, x, y, n_bins=800):
+    """Keep first/last/min/max rows per x-bin (M4), so the line looks the same at ~plot pixel width"""
+    n = len(data)
+    if n <= 4 * n_bins:
+        return data
+    x_vals = data[x].to_numpy().astype('int64') if data[x].dtype.kind == 'M' else data[x].to_numpy(dtype=float)
+    span = max(x_vals[-1] - x_vals[0], 1)
+    bins = np.minimum(((x_vals - x_vals[0]) / span * n_bins).astype(int), n_bins - 1)
+    # x is sorted, so each bin is a contiguous run of rows
+    first = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+    last = np.r_[first[1:] - 1, n - 1]
+    by_bin = pd.Series(data[y].to_numpy()).groupby(bins)
+    keep = np.unique(np.concatenate([first, last, by_bin.idxmin().to_numpy(), by_bin.idxmax().to_numpy()]))
+    return data.iloc[keep]
 
-# Filter Data
-filtered_df = df.copy()
-if selected_state != 'All':
-    filtered_df = filtered_df[filtered_df['State_Full'] == selected_state]
-if selected_project != 'All':
-    filtered_df = filtered_df[filtered_df['Project_Type_Full'] == selected_project]
-
-# ========== OVERVIEW METRICS ==========
-st.markdown("### 📊 Procurement Overview")
-col1, col2, col3, col4 = st.columns(4)
-with col1:
-    total_states = filtered_df['State_Full'].nunique()
-    st.metric("Active States", total_states)
-with col2:
-    total_projects = len(filtered_df)
-    st.metric("Total Projects", f"{total_projects:,}")
-with col3:
-    estimated_budget = filtered_df['Quantity_Procured'].sum() * 0.002
-    st.metric("Total Budget", f"₹{estimated_budget:.0f} Cr")
-with col4:
-    if 'GST_Rate' in filtered_df.columns and not filtered_df.empty:
-        avg_gst = filtered_df['GST_Rate'].mean()
-        st.metric("Avg GST Rate", f"{avg_gst:.1f}%")
-    else:
-        st.metric("Avg GST Rate", "N/A")
-st.markdown("---")
+# ===== DATA LOAD =====
+# Shared read-only objects: cache_resource skips the per-call copy that cache_data makes
+@st.cache_resource
+def load_data():
+    # Typed columnar file: only the needed columns are read and Date is already datetime
+    df = pd.read_parquet('hybrid_cleaned.parquet', engine='pyarrow', columns=NEEDED_COLUMNS).astype(COLUMN_DTYPES)
+    # Derive user-friendly fields for mapping (renames the few categories, not every row)
+    df['Project_Type_Full'] = relabel_categories(df['Project_Type'], project_type_map)
+    df['State_Full'] = relabel_categories(df['State'], state_map)
+    # Filter options come straight from the (small) category lists, computed once
+    state_options = ['All'] + sorted(df['State_Full'].cat.categories)
+    project_options = ['All'] + sorted(df['Project_Type_Full'].cat.categories)
+    # Quantity per (state, project type) cell, so budget is a sum over a handful of cells
+    budget_table = df.groupby(['State_Full', 'Project_Type_Full'], observed=True)['Quantity_Procured'].sum()
+    return df, state_options, project_options, budget_table
 
-# ===== BUDGET UTILIZATION PROGRESS BAR =====
-planned_budget = 4000  # Set as per organization policy
-budget_utilized_pct = int((estimated_budget / planned_budget) * 100) if planned_budget > 0 else 0
-if budget_utilized_pct > 100:
-    budget_utilized_pct = 100
-st.markdown("#### 💰 Budget Utilization")
-st.progress(budget_utilized_pct, text=f"{budget_utilized_pct}% of planned budget used ({estimated_budget:.0f} Cr / {planned_budget} Cr)")
-st.caption("Tracks actual procurement spend vs. your planning target. Update 'planned_budget' as needed.")
+_, states, project_types, _ = load_data()
 
 st.markdown("---")
 
-# ========== MONTHLY TREND ==========
-st.markdown("### 📈 Demand Trend Analysis")
-if not filtered_df.empty:
-    filtered_df['Month'] = filtered_df['Date'].dt.to_period('M').astype(str)
-    monthly_demand = filtered_df.groupby('Month')['Quantity_Procured'].sum().reset_index()
-    fig = px.line(
-        monthly_demand,
-        x='Month',
-        y='Quantity_Procured',
-        title='Monthly Material Demand Trend',
-        labels={'Quantity_Procured': 'Total Quantity', 'Month': 'Month'},
-        markers=True
-    )
+# Filter Data
+@st.cache_data
+def compute_view(selected_state, selected_project):
+    """Filtered monthly demand and overview metrics, memoized per filter selection"""
+    df, _, _, budget_table = load_data()
+    
+    # One mask over integer category codes, applied once
+    mask = np.ones(len(df), dtype=bool)
+    if selected_state != 'All':
+        state_code = df['State_Full'].cat.categories.get_loc(selected_state)
+        mask &= df['State_Full'].cat.codes.to_numpy() == state_code
+    if selected_project != 'All':
+        project_code = df['Project_Type_Full'].cat.categories.get_loc(selected_project)
+        mask &= df['Project_Type_Full'].cat.codes.to_numpy() == project_code
+    filtered_df = df.loc[mask]
+    
+    # Bin by month start on Date directly (no set_index copy of the whole frame)
+    monthly_demand = filtered_df.resample('MS', on='Date')['Quantity_Procured'].sum().reset_index()
+    # Budget from the precomputed (state, project type) cells instead of a row scan
+    cells = budget_table
+    if selected_state != 'All':
+        cells = cells[cells.index.get_level_values('State_Full') == selected_state]
+    if selected_project != 'All':
+        cells = cells[cells.index.get_level_values('Project_Type_Full') == selected_project]
+    
+    # Distinct states counted over the int8 category codes (-1 = missing), not strings
+    state_codes = filtered_df['State_Full'].cat.codes.to_numpy()
+    metrics = {
+        'total_states': int(np.count_nonzero(np.bincount(state_codes[state_codes >= 0]))),
+        'total_projects': len(filtered_df),
+        'estimated_budget': cells.sum() * 0.002,
+        'avg_gst': filtered_df['GST_Rate'].mean() if not filtered_df.empty else None  # float32 column
+    }
+    return monthly_demand, metrics
+
+@st.cache_data
+def build_trend_fig(selected_state, selected_project):
+    """Monthly trend chart as Plotly JSON, built once per filter selection"""
+    monthly_demand, _ = compute_view(selected_state, selected_project)
+    monthly_demand = m4_downsample(monthly_demand, 'Date', 'Quantity_Procured')
+    # WebGL trace stays responsive as the series grows
+    fig = go.Figure(go.Scattergl(
+        x=monthly_demand['Date'],
+        y=monthly_demand['Quantity_Procured'],
+        mode='lines+markers',
+        name='Demand'
+    ))
     fig.update_layout(
+        title='Monthly Material Demand Trend',
+        xaxis_title='Month',
+        yaxis_title='Total Quantity',
         xaxis_tickangle=-45,
+        xaxis_tickformat='%Y-%m',
         height=400
     )
-    st.plotly_chart(fig, use_container_width=True)
-else:
-    st.info("No data for selected filters.")
+    return fig.to_json()
+
+@st.cache_resource
+def default_trend_fig():
+    """Unfiltered (All/All) figure kept as one shared object; most visits never touch the filters"""
+    return pio.from_json(build_trend_fig('All', 'All'))
+
+# Filters, metrics and trend rerun on their own when a filter changes
+@st.fragment
+def filter_and_show():
+    # ======================= FILTERS =========================
+    st.markdown("### 🔎 Filter Procurement Data")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        selected_state = st.selectbox("Select State", options=states)
+    with col2:
+        selected_project = st.selectbox("Select Project Type", options=project_types)
+    
+    _, metrics = compute_view(selected_state, selected_project)
+    
+    # ========== OVERVIEW METRICS ==========
+    st.markdown("### 📊 Procurement Overview")
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Active States", metrics['total_states'])
+    with col2:
+        st.metric("Total Projects", f"{metrics['total_projects']:,}")
+    with col3:
+        estimated_budget = metrics['estimated_budget']
+        st.metric("Total Budget", f"₹{estimated_budget:.0f} Cr")
+    with col4:
+        if metrics['avg_gst'] is not None:
+            st.metric("Avg GST Rate", f"{metrics['avg_gst']:.1f}%")
+        else:
+            st.metric("Avg GST Rate", "N/A")
+    st.markdown("---")
+    
+    # ===== BUDGET UTILIZATION PROGRESS BAR =====
+    planned_budget = 4000  # Set as per organization policy
+    budget_utilized_pct = int((estimated_budget / planned_budget) * 100) if planned_budget > 0 else 0
+    if budget_utilized_pct > 100:
+        budget_utilized_pct = 100
+    st.markdown("#### 💰 Budget Utilization")
+    st.progress(budget_utilized_pct, text=f"{budget_utilized_pct}% of planned budget used ({estimated_budget:.0f} Cr / {planned_budget} Cr)")
+    st.caption("Tracks actual procurement spend vs. your planning target. Update 'planned_budget' as needed.")
+    
+    st.markdown("---")
+    
+    # ========== MONTHLY TREND ==========
+    st.markdown("### 📈 Demand Trend Analysis")
+    if metrics['total_projects'] > 0:
+        if selected_state == 'All' and selected_project == 'All':
+            fig = default_trend_fig()
+        else:
+            fig = pio.from_json(build_trend_fig(selected_state, selected_project))
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info("No data for selected filters.")
+
+filter_and_show()
 
 st.markdown("---")
 st.caption("Data-driven procurement intelligence powered by AI analytics")